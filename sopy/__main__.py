@@ -2,19 +2,24 @@ import sys
 from .start_server import start_server
 from .stop_server import stop_server
 
+COMMANDS = {
+    "start": start_server,
+    "stop": stop_server,
+}
+
+USAGE = f"Usage: python -m sopy {{{'|'.join(COMMANDS)}}}"
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python -m sopy {start|stop}")
-        sys.exit(1)
-    
-    if sys.argv[1] == "start":
-        sys.exit(start_server())
-    elif sys.argv[1] == "stop":
-        sys.exit(stop_server())
-    else:
-        print(f"Unknown command: {sys.argv[1]}")
-        print("Usage: python -m sopy {start|stop}")
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    handler = COMMANDS.get(command)
+
+    if handler is None:
+        if command is not None:
+            print(f"Unknown command: {command}")
+        print(USAGE)
         sys.exit(1)
 
+    sys.exit(handler())
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
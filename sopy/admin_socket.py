@@ -3,13 +3,20 @@
 Admin socket module for managing authentication credentials and backend URLs via Unix socket.
 """
 import asyncio
-import json
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import orjson
 import os
 import socket
+import struct
 import sys
 import sqlite3
 from pathlib import Path
 
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
 # Import the OpenAI router to update registered models
 from sopy.openai_router import update_registered_models
 
@@ -20,41 +27,186 @@ ADMIN_PORT = 8001  # TCP port for Windows compatibility
 # Database path
 DB_PATH = Path("sopy_admin.db")
 
+# Secrets (backend credentials and user API keys) are stored encrypted at
+# rest with AES-GCM when a master key is configured via this environment
+# variable; without one, values are stored as plain bytes. The key material
+# is hashed to a fixed 256-bit key so any passphrase works.
+MASTER_KEY_ENV = "SOPY_MASTER_KEY"
+
+_master_key_raw = os.environ.get(MASTER_KEY_ENV)
+_master_key = hashlib.sha256(_master_key_raw.encode()).digest() if _master_key_raw else None
+
+def _encrypt_secret(value):
+    """Encrypt a secret string for storage; returns a BLOB (nonce + ciphertext)."""
+    if _master_key is None:
+        return value.encode()
+    nonce = os.urandom(12)
+    return nonce + AESGCM(_master_key).encrypt(nonce, value.encode(), None)
+
+def _decrypt_secret(blob):
+    """Decrypt a stored secret back to its string form.
+
+    Rows written before encryption was introduced (TEXT values, or BLOBs
+    written without a master key) are passed through unchanged.
+    """
+    if isinstance(blob, str):
+        return blob
+    if _master_key is None:
+        return blob.decode()
+    try:
+        return AESGCM(_master_key).decrypt(blob[:12], blob[12:], None).decode()
+    except Exception:
+        # Legacy plaintext row predating the master key
+        return blob.decode()
+
+# SQL reused across handlers. sqlite3 caches compiled statements per unique
+# SQL string on the connection, so keeping the text in one place guarantees
+# each of these is parsed and planned only once for the connection lifetime.
+_SQL_ADD_ADMIN_AUTH = "INSERT OR REPLACE INTO admin_credentials (name, credentials) VALUES (?, ?)"
+_SQL_REMOVE_ADMIN_AUTH = "DELETE FROM admin_credentials WHERE name = ?"
+_SQL_LIST_ADMIN_AUTH = "SELECT name FROM admin_credentials"
+_SQL_GET_ADMIN_AUTH = "SELECT credentials FROM admin_credentials WHERE name = ?"
+_SQL_ADD_USER_API_KEY = "INSERT INTO user_api_keys (api_key, description) VALUES (?, ?)"
+_SQL_REMOVE_USER_API_KEY_BY_ID = "DELETE FROM user_api_keys WHERE id = ?"
+_SQL_LIST_USER_API_KEY_VALUES = "SELECT id, api_key FROM user_api_keys"
+_SQL_LIST_USER_API_KEYS = "SELECT id, api_key, description, created_at, is_active FROM user_api_keys"
+_SQL_GET_USER_API_KEY = "SELECT id, api_key, description, created_at, is_active FROM user_api_keys WHERE id = ?"
+_SQL_ACTIVATE_USER_API_KEY = "UPDATE user_api_keys SET is_active = 1 WHERE id = ?"
+_SQL_DEACTIVATE_USER_API_KEY = "UPDATE user_api_keys SET is_active = 0 WHERE id = ?"
+_SQL_ADD_BACKEND = "INSERT OR IGNORE INTO backends (provider, url) VALUES (?, ?)"
+_SQL_REMOVE_BACKEND = "DELETE FROM backends WHERE provider = ? AND url = ?"
+_SQL_ADD_MODEL_MAPPING = "INSERT OR REPLACE INTO model_mappings (model_name, provider) VALUES (?, ?)"
+_SQL_REMOVE_MODEL_MAPPING = "DELETE FROM model_mappings WHERE model_name = ?"
+
+def _frame(response):
+    """Encode a response as a complete length-prefixed wire frame."""
+    payload = orjson.dumps(response)
+    return struct.pack(">I", len(payload)) + payload
+
+# Static error responses on the hot path, framed once at import time so
+# serving them is a single write with no serialization work
+_ERR_INVALID_JSON = _frame({"status": "error", "message": "Invalid JSON"})
+_ERR_UNAUTHORIZED = _frame({"status": "error", "message": "Unauthorized"})
+
+def db_handler(fn):
+    """Shared error handling for command handlers.
+
+    Missing required fields surface as KeyError from the handler's
+    command[...] lookups and are formatted uniformly here; anything else
+    that escapes is reported as a database error. Handlers keep any more
+    specific handling (e.g. IntegrityError) inline.
+    """
+    @functools.wraps(fn)
+    async def wrapper(self, command):
+        try:
+            return await fn(self, command)
+        except KeyError as e:
+            return {"status": "error", "message": f"Missing required field: {e}"}
+        except Exception as e:
+            return {"status": "error", "message": f"Database error: {e}"}
+    return wrapper
+
 class AdminSocketServer:
     def __init__(self):
         self.socket_path = ADMIN_SOCKET_PATH
         self.server = None
         self.db_path = DB_PATH
+        # One long-lived connection so SQLite's page cache survives across
+        # commands instead of being rebuilt on every open. Default isolation
+        # so "with self.conn:" wraps writes in implicit BEGIN...COMMIT
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._configure_connection()
+        # Single-writer discipline: handlers that mutate the database
+        # serialize on this lock while WAL keeps reads running in parallel
+        self._write_lock = asyncio.Lock()
+        # Dedicated DB thread so blocking sqlite3 calls (and their fsyncs)
+        # never stall the event loop; one worker keeps writes serialized
+        self._db_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sopy-db"
+        )
+        # While a batch is running, per-op commits and router refreshes are
+        # suppressed; the batch commits once and refreshes the router once
+        self._in_batch = False
+        # Write handlers mark the router dirty instead of rebuilding it
+        # inline; a background task coalesces bursts into one rebuild
+        self._router_dirty = asyncio.Event()
+        self._router_task = None
         self.init_database()
+
+    async def _run(self, fn, *args):
+        """Run a blocking database function on the dedicated DB thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_pool, fn, *args)
+
+    async def _execute(self, sql, params=()):
+        """Execute a write statement off-loop and return its cursor.
+
+        Inside a batch the per-statement commit is skipped; the enclosing
+        transaction commits once for all operations.
+        """
+        def op():
+            cursor = self.conn.cursor()
+            if self._in_batch:
+                cursor.execute(sql, params)
+                return cursor
+            # The connection context manager commits on success and rolls
+            # back on exception, so no partial write ever stays visible
+            with self.conn:
+                cursor.execute(sql, params)
+            return cursor
+        return await self._run(op)
+
+    async def _query(self, sql, params=()):
+        """Execute a read query off-loop and return all rows."""
+        def op():
+            return self.conn.execute(sql, params).fetchall()
+        return await self._run(op)
+
+    @contextlib.asynccontextmanager
+    async def _write_guard(self):
+        """Serialize a write against all other writes.
+
+        Outside a batch this is just the write lock. Inside a batch the
+        lock is already held for the whole transaction by process_batch,
+        and asyncio locks are not reentrant, so acquiring it again here
+        would deadlock; the flag is only ever set under the lock, so
+        seeing it set means this coroutine is the batch.
+        """
+        if self._in_batch:
+            yield
+        else:
+            async with self._write_lock:
+                yield
+
+    def _configure_connection(self):
+        """Apply the connection pragmas (WAL, relaxed fsync, larger cache)."""
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=memory")
+        cursor.execute("PRAGMA cache_size=-64000")
+        # Deleted pages need not be overwritten: secrets are encrypted at
+        # rest, so the overwrite pass is pure write amplification
+        cursor.execute("PRAGMA secure_delete=OFF")
         
     async def update_openai_router(self):
-        """Update the OpenAI router with current backends and model mappings."""
+        """Update the OpenAI router with current backends and model mappings.
+
+        Works entirely from the in-memory caches, which the write handlers
+        keep in step with the database. During a batch the refresh is
+        deferred until all operations have run.
+        """
+        if self._in_batch:
+            return
         try:
-            # Get all backends from database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT provider, url FROM backends")
-            backend_rows = cursor.fetchall()
-            
-            # Get all model mappings from database
-            cursor.execute("SELECT model_name, provider FROM model_mappings")
-            mapping_rows = cursor.fetchall()
-            conn.close()
-            
-            # Organize backends by provider
-            backends = {}
-            for provider, url in backend_rows:
-                if provider not in backends:
-                    backends[provider] = []
-                backends[provider].append(url)
-            
             # Create model to backend URL mapping
             model_backends = {}
-            for model_name, provider in mapping_rows:
+            for model_name, provider in self._mappings.items():
                 # Get the first backend URL for the provider
-                if provider in backends and backends[provider]:
-                    model_backends[model_name] = backends[provider][0]
-            
+                urls = self._backends.get(provider)
+                if urls:
+                    model_backends[model_name] = urls[0]
+
             # Update registered models in the OpenAI router
             update_registered_models(model_backends)
         except Exception as e:
@@ -62,22 +214,25 @@ class AdminSocketServer:
         
     def init_database(self):
         """Initialize the SQLite database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
         # Create admin credentials table (for backend providers)
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS admin_credentials (
                 name TEXT PRIMARY KEY,
-                credentials TEXT NOT NULL
+                credentials BLOB NOT NULL
             )
         ''')
         
-        # Create user API keys table (for client-facing API keys)
+        # Create user API keys table (for client-facing API keys). The
+        # UNIQUE constraint only deduplicates the stored bytes: with a
+        # master key configured, AES-GCM produces a different ciphertext
+        # for every insert, so real uniqueness is enforced by
+        # add_user_api_key's decrypt-and-compare check under the write lock
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS user_api_keys (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                api_key TEXT UNIQUE NOT NULL,
+                api_key BLOB UNIQUE NOT NULL,
                 description TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 is_active BOOLEAN DEFAULT 1
@@ -88,8 +243,9 @@ class AdminSocketServer:
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='credentials'")
         if cursor.fetchone() and not cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='user_api_keys'").fetchone():
             print("Migrating from old credentials table to admin_credentials...")
-            cursor.execute("INSERT OR REPLACE INTO admin_credentials SELECT * FROM credentials")
-            cursor.execute("DROP TABLE credentials")
+            with self.conn:
+                cursor.execute("INSERT OR REPLACE INTO admin_credentials SELECT * FROM credentials")
+                cursor.execute("DROP TABLE credentials")
             print("Migration completed.")
         
         # Create backends table
@@ -109,606 +265,639 @@ class AdminSocketServer:
                 provider TEXT NOT NULL
             )
         ''')
-        
-        conn.commit()
-        conn.close()
-        
-        # Update OpenAI router with existing backends and model mappings
-        asyncio.create_task(self.update_openai_router())
-        
+
+        # Indexes for the lookup columns: provider filters on backends, and
+        # a partial index over active user API keys
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_backends_provider
+            ON backends(provider)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_user_api_keys_active
+            ON user_api_keys(is_active) WHERE is_active = 1
+        ''')
+
+        # Warm the in-memory config caches; the write handlers mutate these
+        # alongside the database so reads never need to re-scan the tables
+        self._load_config_caches()
+
+    def _load_config_caches(self):
+        """(Re)build the backend and mapping caches from the database.
+
+        Called at startup and after a batch rollback, when cache
+        mutations made by already-executed operations must be discarded
+        along with the transaction.
+        """
+        backends = {}
+        for provider, url in self.conn.execute("SELECT provider, url FROM backends"):
+            backends.setdefault(provider, []).append(url)
+        self._backends = backends
+        self._mappings = dict(self.conn.execute("SELECT model_name, provider FROM model_mappings"))
+
+    async def _router_update_loop(self):
+        """Coalesce router refresh requests into single rebuilds.
+
+        A burst of admin writes (e.g. an operator provisioning dozens of
+        mappings) sets the dirty event repeatedly; this task wakes once,
+        lets the burst settle briefly, and performs one rebuild for all
+        of it.
+        """
+        while True:
+            await self._router_dirty.wait()
+            # Give a burst of writes a moment to finish
+            await asyncio.sleep(0.05)
+            self._router_dirty.clear()
+            await self.update_openai_router()
+
     async def start_server(self):
         """Start the server for admin commands (Unix socket on Unix, TCP socket on Windows)."""
-        if os.name == 'nt':  # Windows
-            # Use TCP socket on Windows
+        # Seed the OpenAI router from the persisted configuration now that
+        # an event loop is running; __init__ may execute without one
+        await self.update_openai_router()
+        self._router_task = asyncio.create_task(self._router_update_loop())
+
+        # Prefer a Unix socket wherever the platform offers one (including
+        # Windows 10 1803+ builds that expose AF_UNIX): local IPC over a
+        # Unix socket skips the TCP/IP stack entirely. TCP on loopback is
+        # kept only as a last resort for platforms/loops without AF_UNIX
+        # support.
+        self.server = None
+        if hasattr(socket, "AF_UNIX") and hasattr(asyncio, "start_unix_server"):
+            try:
+                # Remove existing socket file if it exists
+                if self.socket_path.exists():
+                    self.socket_path.unlink()
+
+                self.server = await asyncio.start_unix_server(
+                    self.handle_client,
+                    path=str(self.socket_path)
+                )
+
+                # Set proper permissions (owner read/write only)
+                os.chmod(self.socket_path, 0o600)
+
+                print(f"Admin socket server started at {self.socket_path}")
+            except (NotImplementedError, OSError) as e:
+                print(f"Unix socket unavailable ({e}), falling back to TCP")
+                self.server = None
+
+        if self.server is None:
+            # TCP fallback, restricted to loopback
             self.server = await asyncio.start_server(
                 self.handle_client,
                 host=ADMIN_HOST,
                 port=ADMIN_PORT
             )
             print(f"Admin TCP server started at {ADMIN_HOST}:{ADMIN_PORT}")
-        else:  # Unix-like systems
-            # Use Unix socket on Unix-like systems
-            # Remove existing socket file if it exists
-            if self.socket_path.exists():
-                self.socket_path.unlink()
-                
-            self.server = await asyncio.start_unix_server(
-                self.handle_client, 
-                path=str(self.socket_path)
-            )
-            
-            # Set proper permissions (owner read/write only)
-            os.chmod(self.socket_path, 0o600)
-            
-            print(f"Admin socket server started at {self.socket_path}")
         
         async with self.server:
             await self.server.serve_forever()
             
+    def _authorize_peer(self, writer):
+        """Check that the connecting peer may issue admin commands.
+
+        On Unix sockets SO_PEERCRED exposes the peer's pid/uid/gid at
+        accept time, so connections from other users are rejected without
+        relying on filesystem permissions alone. The Windows TCP fallback
+        stays restricted to the loopback bind address.
+        """
+        sock = writer.get_extra_info('socket')
+        # getattr: AF_UNIX is undefined on Windows builds without Unix
+        # socket support, where the TCP fallback is the only transport
+        if sock is None or sock.family != getattr(socket, "AF_UNIX", None):
+            return True
+        if not hasattr(socket, "SO_PEERCRED"):
+            # Platform without peer credentials; socket file permissions
+            # (0600) remain the access control
+            return True
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        pid, uid, gid = struct.unpack("3i", creds)
+        return uid == os.geteuid()
+
+    async def send_response(self, writer, response):
+        """Send a length-prefixed response to the client."""
+        payload = orjson.dumps(response)
+        writer.write(struct.pack(">I", len(payload)) + payload)
+        await writer.drain()
+
     async def handle_client(self, reader, writer):
-        """Handle incoming client connections."""
+        """Handle incoming client connections.
+
+        Clients keep their connection open and send one length-prefixed
+        frame per command (4-byte big-endian size followed by the JSON
+        payload), so this loops until the peer disconnects.
+        """
         try:
-            # Read command
-            data = await reader.read(1024)
-            if not data:
-                return
-                
-            try:
-                command = json.loads(data.decode())
-            except json.JSONDecodeError:
-                response = {"status": "error", "message": "Invalid JSON"}
-                writer.write(json.dumps(response).encode())
+            sock = writer.get_extra_info('socket')
+            if sock is not None and sock.family == socket.AF_INET:
+                # Responses are tiny request/reply frames; Nagle would sit
+                # on them waiting for an ACK on the TCP fallback path
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # Flush each response straight to the socket rather than
+            # parking small writes in the transport buffer
+            writer.transport.set_write_buffer_limits(high=0)
+
+            if not self._authorize_peer(writer):
+                writer.write(_ERR_UNAUTHORIZED)
                 await writer.drain()
-                writer.close()
-                await writer.wait_closed()
                 return
-                
-            # Process command
-            response = await self.process_command(command)
-            
-            # Send response
-            writer.write(json.dumps(response).encode())
-            await writer.drain()
-            
+
+            while True:
+                # Read one length-prefixed command frame
+                try:
+                    header = await reader.readexactly(4)
+                except asyncio.IncompleteReadError:
+                    break
+                (length,) = struct.unpack(">I", header)
+                data = await reader.readexactly(length)
+
+                try:
+                    command = orjson.loads(data)
+                except orjson.JSONDecodeError:
+                    writer.write(_ERR_INVALID_JSON)
+                    await writer.drain()
+                    continue
+
+                # Process command
+                response = await self.process_command(command)
+
+                # Send response
+                await self.send_response(writer, response)
+
         except Exception as e:
-            response = {"status": "error", "message": str(e)}
-            writer.write(json.dumps(response).encode())
-            await writer.drain()
+            try:
+                await self.send_response(writer, {"status": "error", "message": str(e)})
+            except (ConnectionError, OSError):
+                pass
         finally:
             writer.close()
             await writer.wait_closed()
             
     async def process_command(self, command):
-        """Process admin commands."""
+        """Process admin commands via the class-level dispatch table."""
         cmd_type = command.get("command")
-        
-        # Admin authentication commands (for backend providers)
-        if cmd_type == "add_admin_auth":
-            return await self.add_admin_auth(command)
-        elif cmd_type == "remove_admin_auth":
-            return await self.remove_admin_auth(command)
-        elif cmd_type == "list_admin_auth":
-            return await self.list_admin_auth(command)
-        elif cmd_type == "get_admin_auth":
-            return await self.get_admin_auth(command)
-        
-        # User API key commands (for client-facing API keys)
-        elif cmd_type == "add_user_api_key":
-            return await self.add_user_api_key(command)
-        elif cmd_type == "remove_user_api_key":
-            return await self.remove_user_api_key(command)
-        elif cmd_type == "list_user_api_keys":
-            return await self.list_user_api_keys(command)
-        elif cmd_type == "get_user_api_key":
-            return await self.get_user_api_key(command)
-        elif cmd_type == "activate_user_api_key":
-            return await self.activate_user_api_key(command)
-        elif cmd_type == "deactivate_user_api_key":
-            return await self.deactivate_user_api_key(command)
-        # Backend commands
-        elif cmd_type == "add_backend":
-            return await self.add_backend(command)
-        elif cmd_type == "remove_backend":
-            return await self.remove_backend(command)
-        elif cmd_type == "list_backends":
-            return await self.list_backends(command)
-        elif cmd_type == "get_backend":
-            return await self.get_backend(command)
-        # Model mapping commands
-        elif cmd_type == "add_model_mapping":
-            return await self.add_model_mapping(command)
-        elif cmd_type == "remove_model_mapping":
-            return await self.remove_model_mapping(command)
-        elif cmd_type == "list_model_mappings":
-            return await self.list_model_mappings(command)
-        elif cmd_type == "get_model_mapping":
-            return await self.get_model_mapping(command)
-        else:
+
+        # Batched commands from clients coalescing concurrent requests
+        if cmd_type == "batch":
+            return await self.process_batch(command)
+
+        handler = self._HANDLERS.get(cmd_type)
+        if handler is None:
             return {"status": "error", "message": f"Unknown command: {cmd_type}"}
-            
+        return await handler(self, command)
+
+    async def process_batch(self, command):
+        """Process a batch of commands and return one result per operation.
+
+        All operations run inside a single transaction, so provisioning N
+        entries costs one fsync instead of N, and the OpenAI router is
+        refreshed once at the end rather than per operation. Per-op errors
+        are preserved in the results array.
+        """
+        # A batch op inside a batch would re-enter here and deadlock
+        # acquiring the non-reentrant write lock the outer batch already
+        # holds; reject it as a per-op error instead
+        if self._in_batch:
+            return {"status": "error", "message": "Nested batches are not supported"}
+
+        ops = command.get("ops")
+        if not isinstance(ops, list):
+            return {"status": "error", "message": "Batch requires a list of ops"}
+
+        # Hold the write lock for the whole batch so no command from
+        # another connection can interleave with the open transaction
+        # (its write would otherwise ride along uncommitted, at the mercy
+        # of this batch's commit or rollback). The batch flag is only set
+        # and cleared under the lock, so handlers running inside the
+        # batch see it set and skip re-acquiring via _write_guard, while
+        # standalone writes can never observe it
+        async with self._write_lock:
+            # The first mutating statement opens the transaction
+            # implicitly; per-op commits are suppressed while the batch
+            # flag is set
+            self._in_batch = True
+            try:
+                results = []
+                for op in ops:
+                    results.append(await self.process_command(op))
+                await self._run(self.conn.commit)
+            except Exception as e:
+                await self._run(self.conn.rollback)
+                # Ops that ran before the failure already mutated the
+                # in-memory caches; reload them from the database so they
+                # match the rolled-back state
+                await self._run(self._load_config_caches)
+                return {"status": "error", "message": f"Batch failed: {e}"}
+            finally:
+                self._in_batch = False
+
+        # One router refresh for the whole batch
+        self._router_dirty.set()
+
+        return {"status": "success", "results": results}
+
+    @db_handler
     async def add_admin_auth(self, command):
         """Add admin authentication credentials (for backend providers)."""
-        try:
-            name = command["name"]
-            credentials = command["credentials"]
-            
-            # Store credentials in database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR REPLACE INTO admin_credentials (name, credentials) VALUES (?, ?)",
-                (name, credentials)
+        name = command["name"]
+        credentials = command["credentials"]
+
+        # Store credentials in database
+        async with self._write_guard():
+            await self._execute(
+                _SQL_ADD_ADMIN_AUTH,
+                (name, _encrypt_secret(credentials))
             )
-            conn.commit()
-            conn.close()
-            
-            return {
-                "status": "success", 
-                "message": f"Authentication credentials for '{name}' added successfully"
-            }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-            
+
+        return {
+            "status": "success",
+            "message": f"Authentication credentials for '{name}' added successfully"
+        }
+
+    @db_handler
     async def remove_admin_auth(self, command):
         """Remove admin authentication credentials (for backend providers)."""
-        try:
-            name = command["name"]
-            
-            # Remove credentials from database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM admin_credentials WHERE name = ?", (name,))
-            deleted = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
-            
-            if deleted:
-                return {
-                    "status": "success", 
-                    "message": f"Authentication credentials for '{name}' removed"
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": f"No credentials found for '{name}'"
-                }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-            
-    async def list_admin_auth(self, command):
-        """List all admin authentication names (without credentials)."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM admin_credentials")
-            auth_names = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            
+        name = command["name"]
+
+        # Remove credentials from database
+        async with self._write_guard():
+            cursor = await self._execute(_SQL_REMOVE_ADMIN_AUTH, (name,))
+        deleted = cursor.rowcount > 0
+
+        if deleted:
             return {
                 "status": "success",
-                "auth_names": auth_names
+                "message": f"Authentication credentials for '{name}' removed"
             }
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-        
+        else:
+            return {
+                "status": "error",
+                "message": f"No credentials found for '{name}'"
+            }
+
+    @db_handler
+    async def list_admin_auth(self, command):
+        """List all admin authentication names (without credentials)."""
+        rows = await self._query(_SQL_LIST_ADMIN_AUTH)
+        auth_names = [row[0] for row in rows]
+
+        return {
+            "status": "success",
+            "auth_names": auth_names
+        }
+
+    @db_handler
     async def get_admin_auth(self, command):
         """Get admin authentication credentials by name."""
-        try:
-            name = command["name"]
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT credentials FROM admin_credentials WHERE name = ?", (name,))
-            row = cursor.fetchone()
-            conn.close()
-            
-            if row:
-                return {
-                    "status": "success",
-                    "name": name,
-                    "credentials": row[0]
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": f"No credentials found for '{name}'"
-                }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-            
+        name = command["name"]
 
+        rows = await self._query(_SQL_GET_ADMIN_AUTH, (name,))
+        row = rows[0] if rows else None
+
+        if row:
+            return {
+                "status": "success",
+                "name": name,
+                "credentials": _decrypt_secret(row[0])
+            }
+        else:
+            return {
+                "status": "error",
+                "message": f"No credentials found for '{name}'"
+            }
+
+
+    @db_handler
     async def add_user_api_key(self, command):
         """Add a user-facing API key."""
-        try:
-            api_key = command.get("api_key")
-            description = command.get("description", "")
-            
-            if not api_key:
-                return {"status": "error", "message": "API key is required"}
-            
-            # Store API key in database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO user_api_keys (api_key, description) VALUES (?, ?)",
-                (api_key, description)
+        api_key = command.get("api_key")
+        description = command.get("description", "")
+
+        if not api_key:
+            return {"status": "error", "message": "API key is required"}
+
+        # AES-GCM ciphertexts are nondeterministic, so uniqueness has to
+        # be checked against the decrypted values rather than the column;
+        # the check-then-insert runs under the write lock so two
+        # concurrent adds of the same key cannot both pass the check
+        async with self._write_guard():
+            if await self._find_user_api_key_id(api_key) is not None:
+                return {"status": "error", "message": "API key already exists"}
+
+            await self._execute(
+                _SQL_ADD_USER_API_KEY,
+                (_encrypt_secret(api_key), description)
             )
-            conn.commit()
-            conn.close()
-            
-            return {
-                "status": "success", 
-                "message": f"User API key added successfully"
-            }
-        except sqlite3.IntegrityError:
-            return {"status": "error", "message": "API key already exists"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
 
+        return {
+            "status": "success",
+            "message": f"User API key added successfully"
+        }
+
+    async def _find_user_api_key_id(self, api_key):
+        """Resolve an API key value to its row id, or None if absent.
+
+        Stored keys are compared after decryption because the ciphertext
+        for a given key differs on every encryption.
+        """
+        rows = await self._query(_SQL_LIST_USER_API_KEY_VALUES)
+        for key_id, stored in rows:
+            if _decrypt_secret(stored) == api_key:
+                return key_id
+        return None
+
+    @db_handler
     async def remove_user_api_key(self, command):
         """Remove a user-facing API key."""
-        try:
-            api_key = command["api_key"]
-            
-            # Remove API key from database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM user_api_keys WHERE api_key = ?", (api_key,))
-            deleted = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
-            
-            if deleted:
-                return {
-                    "status": "success", 
-                    "message": f"User API key removed"
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": f"No user API key found"
-                }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
+        api_key = command["api_key"]
+
+        # Remove API key from database
+        key_id = await self._find_user_api_key_id(api_key)
+        deleted = key_id is not None
+        if deleted:
+            async with self._write_guard():
+                await self._execute(_SQL_REMOVE_USER_API_KEY_BY_ID, (key_id,))
 
+        if deleted:
+            return {
+                "status": "success",
+                "message": f"User API key removed"
+            }
+        else:
+            return {
+                "status": "error",
+                "message": f"No user API key found"
+            }
+
+    @db_handler
     async def list_user_api_keys(self, command):
         """List all user-facing API keys."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, api_key, description, created_at, is_active FROM user_api_keys")
-            keys = []
-            for row in cursor.fetchall():
-                keys.append({
+        rows = await self._query(_SQL_LIST_USER_API_KEYS)
+        keys = []
+        for row in rows:
+            keys.append({
+                "id": row[0],
+                "api_key": _decrypt_secret(row[1]),
+                "description": row[2],
+                "created_at": row[3],
+                "is_active": bool(row[4])
+            })
+
+        return {
+            "status": "success",
+            "user_api_keys": keys
+        }
+
+    @db_handler
+    async def get_user_api_key(self, command):
+        """Get a user-facing API key by ID."""
+        key_id = command["id"]
+
+        rows = await self._query(_SQL_GET_USER_API_KEY, (key_id,))
+        row = rows[0] if rows else None
+
+        if row:
+            return {
+                "status": "success",
+                "user_api_key": {
                     "id": row[0],
-                    "api_key": row[1],
+                    "api_key": _decrypt_secret(row[1]),
                     "description": row[2],
                     "created_at": row[3],
                     "is_active": bool(row[4])
-                })
-            conn.close()
-            
+                }
+            }
+        else:
             return {
-                "status": "success",
-                "user_api_keys": keys
+                "status": "error",
+                "message": f"No user API key found with ID {key_id}"
             }
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-
-    async def get_user_api_key(self, command):
-        """Get a user-facing API key by ID."""
-        try:
-            key_id = command["id"]
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT id, api_key, description, created_at, is_active FROM user_api_keys WHERE id = ?", (key_id,))
-            row = cursor.fetchone()
-            conn.close()
-            
-            if row:
-                return {
-                    "status": "success",
-                    "user_api_key": {
-                        "id": row[0],
-                        "api_key": row[1],
-                        "description": row[2],
-                        "created_at": row[3],
-                        "is_active": bool(row[4])
-                    }
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": f"No user API key found with ID {key_id}"
-                }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
 
+    @db_handler
     async def activate_user_api_key(self, command):
         """Activate a user-facing API key."""
-        try:
-            key_id = command["id"]
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("UPDATE user_api_keys SET is_active = 1 WHERE id = ?", (key_id,))
-            updated = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
-            
-            if updated:
-                return {
-                    "status": "success", 
-                    "message": f"User API key activated"
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": f"No user API key found with ID {key_id}"
-                }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
+        key_id = command["id"]
+
+        async with self._write_guard():
+            cursor = await self._execute(_SQL_ACTIVATE_USER_API_KEY, (key_id,))
+        updated = cursor.rowcount > 0
+
+        if updated:
+            return {
+                "status": "success",
+                "message": f"User API key activated"
+            }
+        else:
+            return {
+                "status": "error",
+                "message": f"No user API key found with ID {key_id}"
+            }
 
+    @db_handler
     async def deactivate_user_api_key(self, command):
         """Deactivate a user-facing API key."""
-        try:
-            key_id = command["id"]
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("UPDATE user_api_keys SET is_active = 0 WHERE id = ?", (key_id,))
-            updated = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
-            
-            if updated:
-                return {
-                    "status": "success", 
-                    "message": f"User API key deactivated"
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": f"No user API key found with ID {key_id}"
-                }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
+        key_id = command["id"]
+
+        async with self._write_guard():
+            cursor = await self._execute(_SQL_DEACTIVATE_USER_API_KEY, (key_id,))
+        updated = cursor.rowcount > 0
+
+        if updated:
+            return {
+                "status": "success",
+                "message": f"User API key deactivated"
+            }
+        else:
+            return {
+                "status": "error",
+                "message": f"No user API key found with ID {key_id}"
+            }
 
+    @db_handler
     async def add_backend(self, command):
         """Add backend URL for a provider."""
-        try:
-            provider = command["provider"]
-            url = command["url"]
-            
-            # Store backend URL in database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR IGNORE INTO backends (provider, url) VALUES (?, ?)",
+        provider = command["provider"]
+        url = command["url"]
+
+        # Store backend URL in database and mirror it in the cache
+        async with self._write_guard():
+            await self._execute(
+                _SQL_ADD_BACKEND,
                 (provider, url)
             )
-            conn.commit()
-            conn.close()
-            
-            # Update registered models in the OpenAI router
-            await self.update_openai_router()
-            
-            return {
-                "status": "success", 
-                "message": f"Backend URL for '{provider}' added successfully"
-            }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-            
+            urls = self._backends.setdefault(provider, [])
+            if url not in urls:
+                urls.append(url)
+
+        # Mark the router dirty; the background task rebuilds it
+        self._router_dirty.set()
+
+        return {
+            "status": "success",
+            "message": f"Backend URL for '{provider}' added successfully"
+        }
+
+    @db_handler
     async def add_model_mapping(self, command):
         """Add model mapping to a provider."""
-        try:
-            model_name = command["model_name"]
-            provider = command["provider"]
-            
-            # Store model mapping in database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT OR REPLACE INTO model_mappings (model_name, provider) VALUES (?, ?)",
+        model_name = command["model_name"]
+        provider = command["provider"]
+
+        # Store model mapping in database and mirror it in the cache
+        async with self._write_guard():
+            await self._execute(
+                _SQL_ADD_MODEL_MAPPING,
                 (model_name, provider)
             )
-            conn.commit()
-            conn.close()
-            
-            # Update registered models in the OpenAI router
-            await self.update_openai_router()
-            
-            return {
-                "status": "success", 
-                "message": f"Model '{model_name}' mapped to provider '{provider}' successfully"
-            }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-            
+            self._mappings[model_name] = provider
+
+        # Mark the router dirty; the background task rebuilds it
+        self._router_dirty.set()
+
+        return {
+            "status": "success",
+            "message": f"Model '{model_name}' mapped to provider '{provider}' successfully"
+        }
+
+    @db_handler
     async def remove_backend(self, command):
         """Remove backend URL for a provider."""
-        try:
-            provider = command["provider"]
-            url = command["url"]
-            
-            # Remove backend URL from database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM backends WHERE provider = ? AND url = ?", (provider, url))
+        provider = command["provider"]
+        url = command["url"]
+
+        # Remove backend URL from database and the cache
+        async with self._write_guard():
+            cursor = await self._execute(_SQL_REMOVE_BACKEND, (provider, url))
             deleted = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
-            
-            # Update registered models in the OpenAI router
             if deleted:
-                await self.update_openai_router()
-                return {
-                    "status": "success", 
-                    "message": f"Backend URL for '{provider}' removed"
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": f"No backend URL found for '{provider}'"
-                }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-            
+                urls = self._backends.get(provider, [])
+                if url in urls:
+                    urls.remove(url)
+                if not urls:
+                    self._backends.pop(provider, None)
+
+        if deleted:
+            # Mark the router dirty; the background task rebuilds it
+            self._router_dirty.set()
+            return {
+                "status": "success",
+                "message": f"Backend URL for '{provider}' removed"
+            }
+        else:
+            return {
+                "status": "error",
+                "message": f"No backend URL found for '{provider}'"
+            }
+
+    @db_handler
     async def remove_model_mapping(self, command):
         """Remove model mapping to a provider."""
-        try:
-            model_name = command["model_name"]
-            
-            # Remove model mapping from database
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM model_mappings WHERE model_name = ?", (model_name,))
+        model_name = command["model_name"]
+
+        # Remove model mapping from database and the cache
+        async with self._write_guard():
+            cursor = await self._execute(_SQL_REMOVE_MODEL_MAPPING, (model_name,))
             deleted = cursor.rowcount > 0
-            conn.commit()
-            conn.close()
-            
-            # Update registered models in the OpenAI router
             if deleted:
-                await self.update_openai_router()
-                return {
-                    "status": "success", 
-                    "message": f"Model mapping for '{model_name}' removed"
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": f"No model mapping found for '{model_name}'"
-                }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-            
-    async def list_backends(self, command):
-        """List all providers and their backend URLs."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get all backends from database
-            cursor.execute("SELECT provider, url FROM backends")
-            rows = cursor.fetchall()
-            
-            # Organize backends by provider
-            backends = {}
-            for provider, url in rows:
-                if provider not in backends:
-                    backends[provider] = []
-                backends[provider].append(url)
-            
-            conn.close()
-            
+                self._mappings.pop(model_name, None)
+
+        if deleted:
+            # Mark the router dirty; the background task rebuilds it
+            self._router_dirty.set()
             return {
                 "status": "success",
-                "backends": backends
+                "message": f"Model mapping for '{model_name}' removed"
             }
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-            
+        else:
+            return {
+                "status": "error",
+                "message": f"No model mapping found for '{model_name}'"
+            }
+
+    @db_handler
+    async def list_backends(self, command):
+        """List all providers and their backend URLs."""
+        # Answer from the in-memory cache; copied so the caller's view
+        # is decoupled from later mutations
+        backends = {provider: list(urls) for provider, urls in self._backends.items()}
+
+        return {
+            "status": "success",
+            "backends": backends
+        }
+
+    @db_handler
     async def list_model_mappings(self, command):
         """List all model mappings to providers."""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get all model mappings from database
-            cursor.execute("SELECT model_name, provider FROM model_mappings")
-            rows = cursor.fetchall()
-            
-            # Organize mappings
-            mappings = {}
-            for model_name, provider in rows:
-                mappings[model_name] = provider
-            
-            conn.close()
-            
+        return {
+            "status": "success",
+            "mappings": dict(self._mappings)
+        }
+
+    @db_handler
+    async def get_backend(self, command):
+        """Get backend URLs for a specific provider."""
+        provider = command["provider"]
+
+        urls = list(self._backends.get(provider, []))
+
+        if urls:
             return {
                 "status": "success",
-                "mappings": mappings
+                "provider": provider,
+                "urls": urls
             }
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-        
-    async def get_backend(self, command):
-        """Get backend URLs for a specific provider."""
-        try:
-            provider = command["provider"]
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT url FROM backends WHERE provider = ?", (provider,))
-            urls = [row[0] for row in cursor.fetchall()]
-            conn.close()
-            
-            if urls:
-                return {
-                    "status": "success",
-                    "provider": provider,
-                    "urls": urls
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": f"No backends found for '{provider}'"
-                }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
-            
+        else:
+            return {
+                "status": "error",
+                "message": f"No backends found for '{provider}'"
+            }
+
+    @db_handler
     async def get_model_mapping(self, command):
         """Get provider for a specific model mapping."""
-        try:
-            model_name = command["model_name"]
-            
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT provider FROM model_mappings WHERE model_name = ?", (model_name,))
-            row = cursor.fetchone()
-            conn.close()
-            
-            if row:
-                return {
-                    "status": "success",
-                    "model_name": model_name,
-                    "provider": row[0]
-                }
-            else:
-                return {
-                    "status": "error", 
-                    "message": f"No mapping found for model '{model_name}'"
-                }
-        except KeyError as e:
-            return {"status": "error", "message": f"Missing required field: {e}"}
-        except Exception as e:
-            return {"status": "error", "message": f"Database error: {e}"}
+        model_name = command["model_name"]
+
+        provider = self._mappings.get(model_name)
+
+        if provider:
+            return {
+                "status": "success",
+                "model_name": model_name,
+                "provider": provider
+            }
+        else:
+            return {
+                "status": "error",
+                "message": f"No mapping found for model '{model_name}'"
+            }
+
+    # Command dispatch table, resolved once at class creation; a dict
+    # lookup replaces the long if/elif chain in process_command
+    _HANDLERS = {
+        # Admin authentication commands (for backend providers)
+        "add_admin_auth": add_admin_auth,
+        "remove_admin_auth": remove_admin_auth,
+        "list_admin_auth": list_admin_auth,
+        "get_admin_auth": get_admin_auth,
+        # User API key commands (for client-facing API keys)
+        "add_user_api_key": add_user_api_key,
+        "remove_user_api_key": remove_user_api_key,
+        "list_user_api_keys": list_user_api_keys,
+        "get_user_api_key": get_user_api_key,
+        "activate_user_api_key": activate_user_api_key,
+        "deactivate_user_api_key": deactivate_user_api_key,
+        # Backend commands
+        "add_backend": add_backend,
+        "remove_backend": remove_backend,
+        "list_backends": list_backends,
+        "get_backend": get_backend,
+        # Model mapping commands
+        "add_model_mapping": add_model_mapping,
+        "remove_model_mapping": remove_model_mapping,
+        "list_model_mappings": list_model_mappings,
+        "get_model_mapping": get_model_mapping,
+    }
 
 async def main():
     """Main entry point for the admin socket server."""
@@ -722,4 +911,10 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    try:
+        # uvloop is unavailable on Windows; fall back to the stdlib loop there
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
\ No newline at end of file
@@ -1,14 +1,63 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
 import asyncio
-import json
+import logging
+import orjson
 import socket
+import struct
 import os
 from pathlib import Path
+from cachetools import TTLCache
 
 # Import the OpenAI router
-from sopy.openai_router import router as openai_router
+from sopy.openai_router import (
+    router as openai_router,
+    open_client,
+    close_client,
+    update_registered_models,
+)
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+async def refresh_registered_models():
+    """Load the model registry from the admin server.
+
+    Each worker process has its own in-memory registry, so every worker
+    pulls the current backends and model mappings at startup rather than
+    waiting for the next admin update.
+    """
+    try:
+        backends_response = await send_admin_command({"command": "list_backends"})
+        mappings_response = await send_admin_command({"command": "list_model_mappings"})
+    except HTTPException as e:
+        logger.warning("Could not load model registry from admin server: %s", e.detail)
+        return
+
+    if backends_response.get("status") != "success" or mappings_response.get("status") != "success":
+        logger.warning("Admin server returned an error while loading the model registry")
+        return
+
+    backends = backends_response["backends"]
+    model_backends = {}
+    for model_name, provider in mappings_response["mappings"].items():
+        urls = backends.get(provider)
+        if urls:
+            model_backends[model_name] = urls[0]
+
+    update_registered_models(model_backends)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Manage shared resources for the application lifetime."""
+    # Create the pooled backend HTTP client once at startup
+    await open_client()
+    # Populate this worker's model registry from the admin server
+    await refresh_registered_models()
+    yield
+    await close_client()
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # Include the OpenAI router
 app.include_router(openai_router)
@@ -21,45 +70,235 @@ def read_root():
 def read_item(name: str):
     return {"message": f"Hello {name}"}
 
-def send_admin_command(command):
-    """Send a command to the admin server and return the response."""
-    try:
-        if os.name == 'nt':  # Windows
-            # Use TCP socket on Windows
-            host = "127.0.0.1"
-            port = 8001
-            # Create TCP socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.connect((host, port))
-        else:  # Unix-like systems
-            # Use Unix socket on Unix-like systems
+class AdminSocketPool:
+    """Pool of persistent connections to the admin server.
+
+    Connections are created lazily up to `size` and reused across requests,
+    so the per-call connect/close cost is paid only once per pooled socket.
+    Every message is framed with a 4-byte big-endian length prefix so
+    responses of any size are read back completely.
+    """
+
+    def __init__(self, size: int = 16):
+        self._size = size
+        self._idle = asyncio.Queue()
+        self._open = 0
+
+    async def _connect(self):
+        """Open a new connection to the admin server."""
+        loop = asyncio.get_running_loop()
+        # Prefer the Unix socket wherever the platform offers AF_UNIX
+        # (including Windows 10 1803+); TCP on loopback is the last resort,
+        # mirroring how the admin server binds.
+        if hasattr(socket, "AF_UNIX"):
             socket_path = Path("/tmp/sopy_admin.sock")
-            
+
             if not socket_path.exists():
+                if os.name == 'nt':
+                    return await self._connect_tcp(loop)
                 raise HTTPException(status_code=500, detail="Admin socket not available")
-            
-            # Create Unix socket
+
             sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-            sock.connect(str(socket_path))
-        
-        # Send command
-        sock.sendall(json.dumps(command).encode())
-        
-        # Receive response
-        response = sock.recv(1024)
-        sock.close()
-        
-        return json.loads(response.decode())
+            sock.setblocking(False)
+            await loop.sock_connect(sock, str(socket_path))
+            return sock
+
+        return await self._connect_tcp(loop)
+
+    async def _connect_tcp(self, loop):
+        """Open a loopback TCP connection to the admin server (fallback)."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        await loop.sock_connect(sock, ("127.0.0.1", 8001))
+        return sock
+
+    async def acquire(self):
+        """Get a pooled connection, creating one if the pool is not full."""
+        try:
+            return self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+
+        if self._open < self._size:
+            self._open += 1
+            try:
+                return await self._connect()
+            except Exception:
+                self._open -= 1
+                raise
+
+        return await self._idle.get()
+
+    def release(self, sock):
+        """Return a healthy connection to the pool."""
+        self._idle.put_nowait(sock)
+
+    def discard(self, sock):
+        """Drop a connection that failed; a fresh one is created on demand."""
+        self._open -= 1
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+_admin_pool = AdminSocketPool()
+
+async def _recv_exactly(loop, sock, count):
+    """Read exactly `count` bytes from a non-blocking socket."""
+    buffer = bytearray()
+    while len(buffer) < count:
+        chunk = await loop.sock_recv(sock, count - len(buffer))
+        if not chunk:
+            raise ConnectionError("Admin server closed the connection")
+        buffer.extend(chunk)
+    return bytes(buffer)
+
+# Admin config changes rarely, so read commands are answered from a short
+# TTL cache instead of a fresh IPC round-trip. Any successful mutating
+# command clears the cache so reads never serve stale config for long.
+_admin_cache = TTLCache(maxsize=512, ttl=2.0)
+
+# Commands that only read admin state and are safe to cache
+_READ_COMMANDS = {
+    "list_auth",
+    "get_auth",
+    "list_backends",
+    "get_backend",
+    "list_model_mappings",
+    "get_model_mapping",
+}
+
+def _command_key(command):
+    """Build a hashable identity for a command and its arguments."""
+    return (command.get("command"), tuple(sorted(
+        (k, v) for k, v in command.items() if k != "command"
+    )))
+
+async def send_admin_command(command):
+    """Send a command to the admin server and return the response.
+
+    Read commands are served from a short TTL cache; mutating commands
+    always hit the admin server and invalidate the cache on success.
+    """
+    cmd_type = command.get("command")
+    cache_key = None
+    if cmd_type in _READ_COMMANDS:
+        cache_key = _command_key(command)
+        cached = _admin_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    response = await _dispatch_admin_command(command)
+
+    if response.get("status") == "success":
+        if cache_key is not None:
+            _admin_cache[cache_key] = response
+        else:
+            # A successful mutation may have changed what reads return
+            _admin_cache.clear()
+
+    return response
+
+# Commands awaiting a response, keyed by _command_key. Identical commands
+# issued while one is already in flight share the same future, and distinct
+# commands queued in the same loop iteration are flushed as one batch.
+_inflight = {}
+_pending = []
+_flush_scheduled = False
+
+async def _dispatch_admin_command(command):
+    """Dispatch a command, coalescing duplicates and batching bursts.
+
+    If an identical command is already in flight, await its result instead
+    of issuing another IPC call. Otherwise the command is queued and a
+    flush is scheduled for the next loop iteration, so concurrent distinct
+    commands ride in a single batched request.
+    """
+    global _flush_scheduled
+
+    key = _command_key(command)
+    future = _inflight.get(key)
+    if future is not None:
+        return await future
+
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    _inflight[key] = future
+    _pending.append((key, command))
+
+    if not _flush_scheduled:
+        _flush_scheduled = True
+        loop.call_soon(lambda: asyncio.ensure_future(_flush_pending()))
+
+    return await future
+
+async def _flush_pending():
+    """Send all queued commands in one request and resolve their futures."""
+    global _flush_scheduled
+    _flush_scheduled = False
+
+    batch = _pending[:]
+    _pending.clear()
+    if not batch:
+        return
+
+    keys = [key for key, _ in batch]
+    commands = [command for _, command in batch]
+    try:
+        if len(commands) == 1:
+            results = [await _send_admin_request(commands[0])]
+        else:
+            response = await _send_admin_request({"command": "batch", "ops": commands})
+            if response.get("status") == "success":
+                results = response["results"]
+            else:
+                results = [response] * len(commands)
+
+        for key, result in zip(keys, results):
+            future = _inflight.pop(key, None)
+            if future is not None and not future.done():
+                future.set_result(result)
+    except Exception as e:
+        for key in keys:
+            future = _inflight.pop(key, None)
+            if future is not None and not future.done():
+                future.set_exception(e)
+
+async def _send_admin_request(command):
+    """Send a command over a pooled admin connection and return the response."""
+    sock = None
+    try:
+        loop = asyncio.get_running_loop()
+        sock = await _admin_pool.acquire()
+
+        # Send command with a 4-byte length prefix
+        payload = orjson.dumps(command)
+        await loop.sock_sendall(sock, struct.pack(">I", len(payload)) + payload)
+
+        # Receive the length-prefixed response
+        header = await _recv_exactly(loop, sock, 4)
+        (length,) = struct.unpack(">I", header)
+        response = await _recv_exactly(loop, sock, length)
+
+        _admin_pool.release(sock)
+        sock = None
+
+        return orjson.loads(response)
     except ConnectionRefusedError:
         raise HTTPException(status_code=500, detail="Admin server not available")
     except FileNotFoundError:
         raise HTTPException(status_code=500, detail="Admin socket not available")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error communicating with admin server: {e}")
+    finally:
+        if sock is not None:
+            _admin_pool.discard(sock)
 
 # Authentication endpoints
 @app.post("/admin/auth")
-def add_auth(name: str, credentials: str):
+async def add_auth(name: str, credentials: str):
     """Add authentication credentials via admin socket."""
     command = {
         "command": "add_auth",
@@ -67,7 +306,7 @@ def add_auth(name: str, credentials: str):
         "credentials": credentials
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {"message": response["message"]}
@@ -75,14 +314,14 @@ def add_auth(name: str, credentials: str):
         raise HTTPException(status_code=400, detail=response["message"])
 
 @app.delete("/admin/auth/{name}")
-def remove_auth(name: str):
+async def remove_auth(name: str):
     """Remove authentication credentials via admin socket."""
     command = {
         "command": "remove_auth",
         "name": name
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {"message": response["message"]}
@@ -90,13 +329,13 @@ def remove_auth(name: str):
         raise HTTPException(status_code=400, detail=response["message"])
 
 @app.get("/admin/auth")
-def list_auth():
+async def list_auth():
     """List all authentication names via admin socket."""
     command = {
         "command": "list_auth"
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {"auth_names": response["auth_names"]}
@@ -104,14 +343,14 @@ def list_auth():
         raise HTTPException(status_code=400, detail=response["message"])
 
 @app.get("/admin/auth/{name}")
-def get_auth(name: str):
+async def get_auth(name: str):
     """Get authentication credentials via admin socket."""
     command = {
         "command": "get_auth",
         "name": name
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {
@@ -123,7 +362,7 @@ def get_auth(name: str):
 
 # Backend endpoints
 @app.post("/admin/backend")
-def add_backend(provider: str, url: str):
+async def add_backend(provider: str, url: str):
     """Add backend URL for a provider via admin socket."""
     command = {
         "command": "add_backend",
@@ -131,7 +370,7 @@ def add_backend(provider: str, url: str):
         "url": url
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {"message": response["message"]}
@@ -139,7 +378,7 @@ def add_backend(provider: str, url: str):
         raise HTTPException(status_code=400, detail=response["message"])
 
 @app.delete("/admin/backend")
-def remove_backend(provider: str, url: str):
+async def remove_backend(provider: str, url: str):
     """Remove backend URL for a provider via admin socket."""
     command = {
         "command": "remove_backend",
@@ -147,7 +386,7 @@ def remove_backend(provider: str, url: str):
         "url": url
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {"message": response["message"]}
@@ -155,13 +394,13 @@ def remove_backend(provider: str, url: str):
         raise HTTPException(status_code=400, detail=response["message"])
 
 @app.get("/admin/backend")
-def list_backends():
+async def list_backends():
     """List all providers and their backend URLs via admin socket."""
     command = {
         "command": "list_backends"
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {"backends": response["backends"]}
@@ -169,14 +408,14 @@ def list_backends():
         raise HTTPException(status_code=400, detail=response["message"])
 
 @app.get("/admin/backend/{provider}")
-def get_backend(provider: str):
+async def get_backend(provider: str):
     """Get backend URLs for a specific provider via admin socket."""
     command = {
         "command": "get_backend",
         "provider": provider
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {
@@ -188,7 +427,7 @@ def get_backend(provider: str):
 
 # Model mapping endpoints
 @app.post("/admin/model_mapping")
-def add_model_mapping(model_name: str, provider: str):
+async def add_model_mapping(model_name: str, provider: str):
     """Add model mapping to a provider via admin socket."""
     command = {
         "command": "add_model_mapping",
@@ -196,7 +435,7 @@ def add_model_mapping(model_name: str, provider: str):
         "provider": provider
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {"message": response["message"]}
@@ -204,14 +443,14 @@ def add_model_mapping(model_name: str, provider: str):
         raise HTTPException(status_code=400, detail=response["message"])
 
 @app.delete("/admin/model_mapping/{model_name}")
-def remove_model_mapping(model_name: str):
+async def remove_model_mapping(model_name: str):
     """Remove model mapping to a provider via admin socket."""
     command = {
         "command": "remove_model_mapping",
         "model_name": model_name
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {"message": response["message"]}
@@ -219,13 +458,13 @@ def remove_model_mapping(model_name: str):
         raise HTTPException(status_code=400, detail=response["message"])
 
 @app.get("/admin/model_mapping")
-def list_model_mappings():
+async def list_model_mappings():
     """List all model mappings to providers via admin socket."""
     command = {
         "command": "list_model_mappings"
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {"mappings": response["mappings"]}
@@ -233,14 +472,14 @@ def list_model_mappings():
         raise HTTPException(status_code=400, detail=response["message"])
 
 @app.get("/admin/model_mapping/{model_name}")
-def get_model_mapping(model_name: str):
+async def get_model_mapping(model_name: str):
     """Get provider for a specific model mapping via admin socket."""
     command = {
         "command": "get_model_mapping",
         "model_name": model_name
     }
     
-    response = send_admin_command(command)
+    response = await send_admin_command(command)
     
     if response["status"] == "success":
         return {
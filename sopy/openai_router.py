@@ -3,11 +3,15 @@
 OpenAI-compatible router for FastAPI.
 """
 from fastapi import APIRouter, HTTPException, Request
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
-import json
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Optional
+from functools import lru_cache
+import orjson
 import httpx
 import logging
+import msgspec
+import types
 
 # Create router
 router = APIRouter(prefix="/v1")
@@ -15,100 +19,191 @@ router = APIRouter(prefix="/v1")
 # Set up logging
 logger = logging.getLogger(__name__)
 
-# In-memory storage for registered models and their backends
-registered_models = {}
+# Shared HTTP client for forwarding requests to backends.
+# Created once at application startup so connections (and TLS sessions)
+# are pooled and reused across requests instead of being re-established
+# on every call.
+_client: Optional[httpx.AsyncClient] = None
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared backend HTTP client, creating it if needed."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=200,
+                max_connections=500,
+                keepalive_expiry=60,
+            ),
+            timeout=httpx.Timeout(60.0),
+        )
+    return _client
+
+async def open_client():
+    """Create the shared backend HTTP client. Called at app startup."""
+    _get_client()
+
+async def close_client():
+    """Close the shared backend HTTP client. Called at app shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# In-memory storage for registered models and their backends. Held as an
+# immutable snapshot that is swapped atomically on every change, so request
+# handlers can read and iterate it without coordinating with writers.
+registered_models: types.MappingProxyType = types.MappingProxyType({})
+
+def _set_registered_models(new_models: dict):
+    """Atomically replace the model registry with a new snapshot."""
+    global registered_models
+    registered_models = types.MappingProxyType(new_models)
+    _rebuild_models_cache()
+
+# Pre-serialized /v1/models response, rebuilt only when the registry changes
+_models_response_cache: Optional[bytes] = None
+
+def _rebuild_models_cache():
+    """Re-serialize the /v1/models response for the current registry."""
+    global _models_response_cache
+    _models_response_cache = orjson.dumps({
+        "object": "list",
+        "data": [
+            {
+                "id": model_name,
+                "object": "model",
+                "created": 1677610602,
+                "owned_by": "sopy"
+            }
+            for model_name in registered_models.keys()
+        ]
+    })
 
 def update_registered_models(model_backends):
     """
     Update the registered models with the current model to backend mappings.
     This function should be called by the admin socket server when backends or model mappings are added or removed.
     """
-    # Clear existing registered models
-    registered_models.clear()
-    
-    # Register models with their backend URLs
-    for model_name, backend_url in model_backends.items():
-        register_model(model_name, backend_url)
-    
-    print(f"Updated registered models: {registered_models}")
-
-class ChatCompletionRequest(BaseModel):
+    _set_registered_models(dict(model_backends))
+    logger.info("Updated registered models: %d model(s)", len(registered_models))
+
+class _RoutingFields(msgspec.Struct):
+    """Just the fields the gateway reads before forwarding a request.
+
+    The body is forwarded to the backend verbatim, so there is no need to
+    validate and re-serialize the full (potentially large) messages array.
+    stream is Optional because SDKs serialize an explicit null for it,
+    which must be accepted (and treated as false) rather than rejected.
+    """
     model: str
-    messages: List[Dict[str, str]]
-    temperature: Optional[float] = 0.7
-    max_tokens: Optional[int] = 150
     stream: Optional[bool] = False
 
-class ChatCompletionResponse(BaseModel):
-    id: str
-    object: str
-    created: int
-    model: str
-    choices: List[Dict[str, Any]]
-    usage: Dict[str, int]
+_routing_decoder = msgspec.json.Decoder(_RoutingFields)
+
+@lru_cache(maxsize=1024)
+def _endpoint(base: str) -> str:
+    """Return the chat-completions URL for a backend base URL.
+
+    No /v1 segment is appended here since it is already part of the
+    configured backend URL. Cached so the concatenation happens once
+    per backend rather than once per request.
+    """
+    return f"{base}/chat/completions"
 
 @router.post("/chat/completions")
-async def chat_completions(request: Request, chat_request: ChatCompletionRequest):
+async def chat_completions(request: Request):
     """
     OpenAI-compatible chat completions endpoint.
+
+    The request body is forwarded to the backend verbatim; only the
+    routing fields (model, stream) are decoded here.
     """
-    print(f"chat_completions called for model: {chat_request.model}, registered_models: {registered_models}")  # Debug print
+    body = await request.body()
+    try:
+        chat_request = _routing_decoder.decode(body)
+    except msgspec.DecodeError as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Invalid request body: {e}"
+        )
+
+    logger.debug("chat_completions called for model=%s", chat_request.model)
     # Check if we have a backend for this model
     if chat_request.model not in registered_models:
-        logger.error(f"404 Error: Model '{chat_request.model}' not found")
+        logger.debug("404 Error: Model '%s' not found", chat_request.model)
         raise HTTPException(
-            status_code=404, 
+            status_code=404,
             detail=f"Model '{chat_request.model}' not found"
         )
-    
+
     # Get backend URL for this model
     backend_url = registered_models[chat_request.model]
-    
+
     # Forward request to backend
     try:
-        async with httpx.AsyncClient() as client:
-            # Prepare the request for the backend
-            backend_request = {
-                "model": chat_request.model,
-                "messages": chat_request.messages,
-                "temperature": chat_request.temperature,
-                "max_tokens": chat_request.max_tokens,
-                "stream": chat_request.stream
-            }
-            
-            # Get authorization header from incoming request
-            auth_header = request.headers.get("Authorization")
-            
-            # Prepare headers for backend request
-            backend_headers = {"Content-Type": "application/json"}
-            if auth_header:
-                backend_headers["Authorization"] = auth_header
-            
-            # Send request to backend
-            response = await client.post(
-                f"{backend_url}/chat/completions",  # Removed /v1 from the URL since it's already in the backend_url
-                json=backend_request,
+        client = _get_client()
+
+        # Get the authorization header from the raw header list to skip
+        # Starlette's case-insensitive str lookup and decode/encode round-trip
+        auth_header = next(
+            (value for key, value in request.headers.raw if key == b"authorization"),
+            None
+        )
+
+        # Prepare headers for backend request (httpx accepts byte tuples)
+        backend_headers = [(b"content-type", b"application/json")]
+        if auth_header:
+            backend_headers.append((b"authorization", auth_header))
+
+        backend_endpoint = _endpoint(backend_url)
+
+        if chat_request.stream:
+            # Stream the backend response through without buffering it;
+            # tokens are forwarded to the caller as soon as they arrive.
+            backend_req = client.build_request(
+                "POST",
+                backend_endpoint,
+                content=body,
                 headers=backend_headers
             )
-            
-            # Log the response for debugging
-            print(f"Backend response status: {response.status_code}")
-            print(f"Backend response headers: {dict(response.headers)}")
-            print(f"Backend response text: {response.text}")
-            
-            # Try to parse and return the response
-            try:
-                json_response = response.json()
-                print("Successfully parsed JSON response")
-                return json_response
-            except Exception as e:
-                logger.error(f"Error parsing response as JSON: {e}")
-                raise HTTPException(
-                    status_code=500, 
-                    detail=f"Error parsing backend response: {str(e)}"
-                )
+            backend_response = await client.send(backend_req, stream=True)
+            # aiter_raw() relays the body bytes undecoded, so if the
+            # backend compressed them the content-encoding header has to
+            # travel along or clients would see opaque compressed bytes
+            passthrough_headers = {}
+            content_encoding = backend_response.headers.get("content-encoding")
+            if content_encoding:
+                passthrough_headers["content-encoding"] = content_encoding
+            return StreamingResponse(
+                backend_response.aiter_raw(),
+                status_code=backend_response.status_code,
+                headers=passthrough_headers,
+                media_type=backend_response.headers.get("content-type", "text/event-stream"),
+                background=BackgroundTask(backend_response.aclose)
+            )
+
+        # Send request to backend
+        response = await client.post(
+            backend_endpoint,
+            content=body,
+            headers=backend_headers
+        )
+
+        logger.debug("Backend response status=%s", response.status_code)
+
+        # Forward the backend body as-is; re-parsing and re-serializing
+        # the JSON here would only add an extra copy.
+        return Response(
+            content=response.content,
+            status_code=response.status_code,
+            media_type=response.headers.get("content-type", "application/json")
+        )
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error forwarding request to backend: {str(e)}")
+        logger.error("Error forwarding request to backend: %s", e)
         raise HTTPException(
             status_code=500, 
             detail=f"Error forwarding request to backend: {str(e)}"
@@ -119,19 +214,10 @@ async def list_models():
     """
     List all available models.
     """
-    print(f"list_models called, registered_models: {registered_models}")  # Debug print
-    return {
-        "object": "list",
-        "data": [
-            {
-                "id": model_name,
-                "object": "model",
-                "created": 1677610602,
-                "owned_by": "sopy"
-            }
-            for model_name in registered_models.keys()
-        ]
-    }
+    logger.debug("list_models called with %d registered model(s)", len(registered_models))
+    if _models_response_cache is None:
+        _rebuild_models_cache()
+    return Response(content=_models_response_cache, media_type="application/json")
 
 def register_model(model_name: str, backend_url: str):
     """
@@ -139,7 +225,9 @@ def register_model(model_name: str, backend_url: str):
     This function would typically be called by the admin socket server
     when backends are added.
     """
-    registered_models[model_name] = backend_url
+    new_models = dict(registered_models)
+    new_models[model_name] = backend_url
+    _set_registered_models(new_models)
 
 def unregister_model(model_name: str):
     """
@@ -148,4 +236,6 @@ def unregister_model(model_name: str):
     when backends are removed.
     """
     if model_name in registered_models:
-        del registered_models[model_name]
\ No newline at end of file
+        new_models = dict(registered_models)
+        del new_models[model_name]
+        _set_registered_models(new_models)
\ No newline at end of file
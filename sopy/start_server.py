@@ -1,92 +1,259 @@
 #!/usr/bin/env python3
 import subprocess
 import os
+import socket
 import sys
 import time
 import signal
 import logging
+import psutil
 from pathlib import Path
 
+# Start uvicorn through a -c bootstrap rather than -m: the child skips the
+# runpy module-as-main machinery and goes straight to the CLI entry point.
+# (Running uvicorn/__main__.py by path instead would put the package
+# directory at sys.path[0], where uvicorn/logging.py shadows the stdlib.)
+_UVICORN_CMD = [sys.executable, "-c", "from uvicorn.main import main; main()"]
+
+# Where the admin socket server listens (mirrors sopy.admin_socket, which
+# is deliberately not imported here to keep the CLI light)
+_ADMIN_SOCKET_PATH = Path("/tmp/sopy_admin.sock")
+_ADMIN_TCP_ADDR = ("127.0.0.1", 8001)
+
+def wait_ready(host, port, timeout=10.0, process=None):
+    """Block until a TCP listener accepts connections or the deadline passes.
+
+    If the spawned process exits before becoming ready, give up
+    immediately instead of probing until the deadline.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.settimeout(0.05)
+        try:
+            s.connect((host, port))
+            return True
+        except OSError:
+            if process is not None and process.poll() is not None:
+                return False
+            time.sleep(0.02)
+        finally:
+            s.close()
+    return False
+
+def _wait_admin_ready(timeout=10.0, process=None):
+    """Block until the admin socket server accepts connections.
+
+    Like wait_ready, bails out as soon as the process is seen dead.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return wait_ready(*_ADMIN_TCP_ADDR, timeout=timeout, process=process)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        s = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        s.settimeout(0.05)
+        try:
+            s.connect(str(_ADMIN_SOCKET_PATH))
+            return True
+        except OSError:
+            if process is not None and process.poll() is not None:
+                return False
+            time.sleep(0.02)
+        finally:
+            s.close()
+    return False
+
+class _SpawnedProcess:
+    """Minimal Popen-compatible handle for a posix_spawn'ed child."""
+
+    def __init__(self, pid):
+        self.pid = pid
+        self.returncode = None
+
+    def poll(self):
+        if self.returncode is None:
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+            except ChildProcessError:
+                return None
+            if pid == self.pid:
+                self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode
+
+    def terminate(self):
+        try:
+            os.kill(self.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+def _spawn(args, stdout_fd):
+    """Spawn a detached child with its stdout/stderr on the given fd.
+
+    posix_spawn skips the fork-side page-table copy of this (already
+    large) interpreter; platforms without it fall back to Popen.
+    """
+    if hasattr(os, "posix_spawn"):
+        file_actions = [
+            (os.POSIX_SPAWN_DUP2, stdout_fd, 1),
+            (os.POSIX_SPAWN_DUP2, stdout_fd, 2),
+            (os.POSIX_SPAWN_CLOSE, stdout_fd),
+        ]
+        pid = os.posix_spawn(
+            args[0], args, os.environ,
+            file_actions=file_actions, setsid=True
+        )
+        return _SpawnedProcess(pid)
+    return subprocess.Popen(
+        args, stdout=stdout_fd, stderr=subprocess.STDOUT, start_new_session=True
+    )
+
+def _rotate_logfile(logfile):
+    """Rotate logs/server.log by rename if it has outgrown the size bound.
+
+    The uvicorn child appends to the logfile through a raw fd, so its
+    output never passes the RotatingFileHandler and the handler alone
+    cannot bound the file. The bound is enforced here instead, before
+    anything opens the file for this run: renaming now is safe because
+    no process holds the file open yet, whereas a handler rollover later
+    would rename the live file out from under the child's fd.
+    """
+    from sopy.utils import LOG_MAX_BYTES, LOG_BACKUP_COUNT
+
+    try:
+        if logfile.stat().st_size < LOG_MAX_BYTES:
+            return
+    except OSError:
+        return
+
+    # Shift server.log.N -> server.log.N+1 with the oldest dropped, the
+    # same naming scheme RotatingFileHandler uses
+    oldest = logfile.with_name(f"{logfile.name}.{LOG_BACKUP_COUNT}")
+    if oldest.exists():
+        oldest.unlink()
+    for i in range(LOG_BACKUP_COUNT - 1, 0, -1):
+        src = logfile.with_name(f"{logfile.name}.{i}")
+        if src.exists():
+            os.replace(src, logfile.with_name(f"{logfile.name}.{i + 1}"))
+    os.replace(logfile, logfile.with_name(f"{logfile.name}.1"))
+
+def _write_pidfile(path, pid):
+    """Record a spawned process as "pid:create_time".
+
+    The creation timestamp lets stop_server verify the pid still refers
+    to the process we started rather than an unrelated one after reuse.
+    """
+    try:
+        create_time = psutil.Process(pid).create_time()
+    except psutil.Error:
+        create_time = 0.0
+    path.write_text(f"{pid}:{create_time}")
+
 def start_server():
-    # Set up logging
-    from sopy.utils import setup_logging
-    logger = setup_logging()
-    
     # Create logs directory if it doesn't exist
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
-    
-    # Generate logfile name with timestamp
-    timestamp = time.strftime("%Y%m%d_%H%M%S")
-    logfile = logs_dir / f"server_{timestamp}.log"
+
+    # One shared logfile, appended across restarts instead of a new
+    # timestamped file per invocation; the size bound is applied here,
+    # before setup_logging or the child opens the file
+    logfile = logs_dir / "server.log"
+    _rotate_logfile(logfile)
+
+    # Set up logging
+    from sopy.utils import setup_logging
+    logger = setup_logging()
     
     # Server details
     host = "127.0.0.1"
     port = 8000
     url = f"http://{host}:{port}"
     
-    print(f"🚀 Starting FastAPI server...")
-    print(f"📍 URL: {url}")
-    print(f"📋 Log file: {logfile}")
-    
-    # Start the admin socket server in background
-    try:
-        admin_process = subprocess.Popen(
-            [sys.executable, "-m", "sopy.admin_socket"],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            start_new_session=True
-        )
-        
-        # Give the admin socket server a moment to start
-        time.sleep(1)
-        
-        # Check if admin process is still running
-        if admin_process.poll() is not None:
-            print("❌ Admin socket server failed to start")
-            return 1
-            
-        print(f"✅ Admin socket server started (PID: {admin_process.pid})")
-        
-    except Exception as e:
-        logger.error(f"❌ Error starting admin socket server: {e}")
-        return 1
-    
-    # Start the main FastAPI server in background
+    # Status lines are accumulated and flushed with one write at the end
+    # instead of a syscall per print
+    out = [
+        f"🚀 Starting FastAPI server...\n",
+        f"📍 URL: {url}\n",
+        f"📋 Log file: {logfile}\n",
+    ]
     try:
-        with open(logfile, 'w') as f:
-            process = subprocess.Popen(
-                [sys.executable, "-m", "uvicorn", "sopy.main:app", "--host", host, "--port", str(port)],
-                stdout=f,
-                stderr=subprocess.STDOUT,
+        # Start the admin socket server in background
+        try:
+            admin_process = subprocess.Popen(
+                [sys.executable, "-m", "sopy.admin_socket"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
                 start_new_session=True
             )
-        
-        # Give the server a moment to start
-        time.sleep(2)
-        
-        # Check if process is still running
-        if process.poll() is None:
-            print(f"✅ Main server started successfully!")
-            print(f"🆔 Main server PID: {process.pid}")
-            print(f"🆔 Admin socket server PID: {admin_process.pid}")
-            print(f"📝 Logs are being written to: {logfile}")
-            print(f"\n💡 To stop the servers, run: kill {process.pid} {admin_process.pid}")
-            print(f"💡 To view logs in real-time, run: tail -f {logfile}")
-            print(f"\n🌐 Visit {url}/docs for interactive API documentation")
-        else:
-            print(f"❌ Main server failed to start. Check logs: {logfile}")
+
+            # Wait until the admin listener accepts connections rather than
+            # sleeping a fixed second and hoping; a crashed child ends the
+            # wait at once
+            if not _wait_admin_ready(process=admin_process):
+                if admin_process.poll() is None:
+                    admin_process.terminate()
+                out.append("❌ Admin socket server failed to start\n")
+                return 1
+
+            out.append(f"✅ Admin socket server started (PID: {admin_process.pid})\n")
+            _write_pidfile(logs_dir / "admin.pid", admin_process.pid)
+
+        except Exception as e:
+            logger.error(f"❌ Error starting admin socket server: {e}")
+            return 1
+
+        # Start the main FastAPI server in background, with one worker per core
+        # so the kernel balances accepted connections across processes
+        uvicorn_cmd = _UVICORN_CMD + [
+            "sopy.main:app",
+            "--host", host, "--port", str(port),
+            "--workers", str(os.cpu_count() or 1),
+            "--backlog", "4096",
+        ]
+        if os.name != 'nt':
+            # uvloop + httptools roughly double async I/O throughput over the
+            # default asyncio loop and h11 parser; neither is available on Windows
+            uvicorn_cmd += ["--loop", "uvloop", "--http", "httptools"]
+
+        try:
+            # Hand the child a raw append-mode fd: no Python file object, no
+            # newline translation on its writes, and appends stay atomic
+            log_fd = os.open(
+                logfile,
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_CLOEXEC", 0),
+                0o644
+            )
+            try:
+                process = _spawn(uvicorn_cmd, log_fd)
+            finally:
+                os.close(log_fd)
+
+            # Wait until the HTTP port accepts connections; readiness is
+            # signalled by the listener, failure by the child exiting
+            if wait_ready(host, port, process=process) and process.poll() is None:
+                _write_pidfile(logs_dir / "main.pid", process.pid)
+                out.append(f"✅ Main server started successfully!\n")
+                out.append(f"🆔 Main server PID: {process.pid}\n")
+                out.append(f"🆔 Admin socket server PID: {admin_process.pid}\n")
+                out.append(f"📝 Logs are being written to: {logfile}\n")
+                out.append(f"\n💡 To stop the servers, run: kill {process.pid} {admin_process.pid}\n")
+                out.append(f"💡 To view logs in real-time, run: tail -f {logfile}\n")
+                out.append(f"\n🌐 Visit {url}/docs for interactive API documentation\n")
+            else:
+                out.append(f"❌ Main server failed to start. Check logs: {logfile}\n")
+                # Kill the admin socket server if main server failed
+                admin_process.terminate()
+                return 1
+
+        except Exception as e:
+            logger.error(f"❌ Error starting main server: {e}")
             # Kill the admin socket server if main server failed
             admin_process.terminate()
             return 1
-            
-    except Exception as e:
-        logger.error(f"❌ Error starting main server: {e}")
-        # Kill the admin socket server if main server failed
-        admin_process.terminate()
-        return 1
-    
-    return 0
+
+        return 0
+    finally:
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
 
 if __name__ == "__main__":
     sys.exit(start_server())
\ No newline at end of file
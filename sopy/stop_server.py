@@ -3,88 +3,291 @@
 Script to stop the Sopy server processes.
 """
 import os
+import select
 import sys
 import signal
-import psutil
-import argparse
+import time
 from pathlib import Path
 
-def find_server_processes():
-    """Find the Sopy server processes by name."""
-    main_process = None
-    admin_process = None
-    
-    # Look for processes with sopy.main or sopy.admin_socket in the command line
-    for proc in psutil.process_iter(['pid', 'cmdline']):
+def _proc_create_time(pid):
+    """Best-effort process start timestamp (epoch seconds), stdlib-only.
+
+    Reads /proc on Linux; returns None where that is unavailable, in
+    which case the pidfile identity check is skipped.
+    """
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            stat = f.read()
+        # Field 22 (starttime, clock ticks since boot); split after the
+        # parenthesised comm, which may itself contain spaces
+        ticks = int(stat.rpartition(b")")[2].split()[19])
+        with open("/proc/stat", "rb") as f:
+            for line in f:
+                if line.startswith(b"btime"):
+                    return int(line.split()[1]) + ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def _read_pidfile(path):
+    """Return the recorded pid if it still refers to our process, else None.
+
+    The pidfile carries "pid:create_time"; comparing the creation
+    timestamp guards against the pid having been reused by an unrelated
+    process since start_server wrote the file.
+    """
+    try:
+        pid_text, _, create_time = path.read_text().partition(":")
+        pid = int(pid_text)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return None
+    except OSError:
+        pass
+
+    if create_time:
+        actual = _proc_create_time(pid)
+        if actual is not None and abs(actual - float(create_time)) > 1.0:
+            return None
+    return pid
+
+def _wait_pid_gone(pid, timeout):
+    """Wait for a (non-child) process to exit.
+
+    Uses pidfd_open + poll where the platform has it, so the wait is
+    event-driven; otherwise falls back to a bounded existence-check loop.
+    """
+    if hasattr(os, "pidfd_open") and hasattr(select, "poll"):
         try:
-            if proc.info['cmdline']:
-                cmdline = ' '.join(proc.info['cmdline'])
-                if 'sopy.main' in cmdline and 'uvicorn' in cmdline:
-                    main_process = proc
-                elif 'sopy.admin_socket' in cmdline:
-                    admin_process = proc
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            pass
-    
-    return main_process, admin_process
+            fd = os.pidfd_open(pid)
+        except OSError:
+            return True  # already gone (or unsupported pid)
+        try:
+            poller = select.poll()
+            poller.register(fd, select.POLLIN)
+            return bool(poller.poll(timeout * 1000))
+        finally:
+            os.close(fd)
 
-def stop_server():
-    """Stop the Sopy server processes."""
-    print("\U0001F50D Searching for Sopy server processes...")
-    
-    main_process, admin_process = find_server_processes()
-    
-    stopped_any = False
-    
-    if main_process:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
         try:
-            main_process.terminate()
-            main_process.wait(timeout=5)
-            print(f"\u2705 Main server (PID: {main_process.pid}) stopped successfully")
-            stopped_any = True
-        except psutil.TimeoutExpired:
-            print(f"\u26A0\uFE0F Main server (PID: {main_process.pid}) did not stop gracefully, forcing termination")
-            main_process.kill()
-            print(f"\u2705 Main server (PID: {main_process.pid}) forcefully terminated")
-            stopped_any = True
-        except Exception as e:
-            print(f"\u274C Error stopping main server (PID: {main_process.pid}): {e}")
-    
-    if admin_process:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+def _stop_by_pidfiles(out, force=False):
+    """Stdlib-only shutdown using the pidfiles written by start_server.
+
+    POSIX-only: the liveness probes and escalation rely on os.kill
+    semantics and SIGKILL, neither of which Windows has. Returns an exit
+    code, or None when no usable pidfile exists and the caller should
+    fall back to scanning the process table. Status lines are appended
+    to out for a single flush by the caller.
+    """
+    logs_dir = Path("logs")
+    targets = []
+    for filename, label in (("main.pid", "Main server"), ("admin.pid", "Admin socket server")):
+        pid = _read_pidfile(logs_dir / filename)
+        if pid is not None:
+            targets.append((label, pid))
+
+    if not targets:
+        return None
+
+    return _stop_pids(targets, out, force=force)
+
+def _stop_pids(targets, out, force=False):
+    """SIGTERM, wait, and escalate for a list of (label, pid) pairs.
+
+    With force=True, SIGKILL is sent immediately with no grace period.
+    """
+    sig = signal.SIGKILL if force else signal.SIGTERM
+    # Signal every process first so their shutdowns overlap
+    for label, pid in targets:
         try:
-            admin_process.terminate()
-            admin_process.wait(timeout=5)
-            print(f"\u2705 Admin socket server (PID: {admin_process.pid}) stopped successfully")
-            stopped_any = True
-        except psutil.TimeoutExpired:
-            print(f"\u26A0\uFE0F Admin socket server (PID: {admin_process.pid}) did not stop gracefully, forcing termination")
-            admin_process.kill()
-            print(f"\u2705 Admin socket server (PID: {admin_process.pid}) forcefully terminated")
-            stopped_any = True
-        except Exception as e:
-            print(f"\u274C Error stopping admin socket server (PID: {admin_process.pid}): {e}")
-    
-    if not stopped_any:
-        print("\u2139\uFE0F No Sopy server processes found")
-        return 1
-    
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
+
+    for label, pid in targets:
+        if _wait_pid_gone(pid, 5):
+            out.append(f"✅ {label} (PID: {pid}) stopped successfully\n")
+        else:
+            out.append(f"⚠️ {label} (PID: {pid}) did not stop gracefully, forcing termination\n")
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            _wait_pid_gone(pid, 5)
+            out.append(f"✅ {label} (PID: {pid}) forcefully terminated\n")
+
     return 0
 
+def _find_procs_linux():
+    """Scan /proc directly for the server pids (Linux fast path).
+
+    One open+read of /proc/PID/cmdline per process, against the several
+    files a psutil.Process construction touches; argv entries are
+    compared as bytes so nothing is decoded.
+    """
+    main_pid = None
+    admin_pid = None
+    for entry in os.scandir('/proc'):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                cmdline = f.read().split(b"\0")
+        except OSError:
+            continue
+        if main_pid is None and any(b'sopy.main' in arg for arg in cmdline) \
+                and any(b'uvicorn' in arg for arg in cmdline):
+            main_pid = int(entry.name)
+        elif admin_pid is None and any(b'sopy.admin_socket' in arg for arg in cmdline):
+            admin_pid = int(entry.name)
+        if main_pid and admin_pid:
+            break
+    return main_pid, admin_pid
+
+def _iter_targets():
+    """Yield ('main'|'admin', proc) for server processes in one scan.
+
+    Fallback for servers started before pidfiles existed or whose
+    pidfiles were removed; imports psutil only when actually needed.
+    Yields each role at most once and stops scanning when both have
+    been seen, so callers can act on matches as they appear without a
+    second traversal.
+    """
+    import psutil
+
+    # One-shot scan: drop psutil's cached process list first so the
+    # iteration skips per-entry pid-reuse revalidation (cache_clear is
+    # psutil >= 6.0; older versions just take the slower path)
+    if hasattr(psutil.process_iter, "cache_clear"):
+        psutil.process_iter.cache_clear()
+
+    seen = set()
+
+    # Look for processes with sopy.main or sopy.admin_socket in the command
+    # line, matching the argv list directly instead of joining it into a
+    # throwaway string per process
+    for proc in psutil.process_iter(attrs=['cmdline'], ad_value=None):
+        cmdline = proc.info['cmdline'] or ()
+        if 'main' not in seen and any('sopy.main' in arg for arg in cmdline) \
+                and any('uvicorn' in arg for arg in cmdline):
+            seen.add('main')
+            yield ('main', proc)
+        elif 'admin' not in seen and any('sopy.admin_socket' in arg for arg in cmdline):
+            seen.add('admin')
+            yield ('admin', proc)
+        if len(seen) == 2:
+            return
+
+def find_server_processes():
+    """Find the Sopy server processes by scanning the process table."""
+    found = dict(_iter_targets())
+    return found.get('main'), found.get('admin')
+
+def stop_server(force=False):
+    """Stop the Sopy server processes."""
+    # Status lines are accumulated and flushed with one write at the end
+    # instead of a syscall per print
+    out = ["\U0001F50D Searching for Sopy server processes...\n"]
+    try:
+        # Fast path: pidfiles recorded at startup, no psutil and no scan.
+        # POSIX-only: on Windows os.kill(pid, 0) is TerminateProcess, not
+        # an existence probe, and SIGKILL does not exist, so Windows goes
+        # straight to the psutil path below
+        if sys.platform != 'win32':
+            result = _stop_by_pidfiles(out, force=force)
+            if result is not None:
+                return result
+
+        if sys.platform == 'linux':
+            # Scan /proc directly and reuse the stdlib shutdown path
+            main_pid, admin_pid = _find_procs_linux()
+            targets = []
+            if main_pid is not None:
+                targets.append(("Main server", main_pid))
+            if admin_pid is not None:
+                targets.append(("Admin socket server", admin_pid))
+            if not targets:
+                out.append("ℹ️ No Sopy server processes found\n")
+                return 1
+            return _stop_pids(targets, out, force=force)
+
+        import psutil
+
+        role_labels = {'main': "Main server", 'admin': "Admin socket server"}
+        labels = {}
+        procs = []
+
+        # One traversal: signal each match as the scan finds it (so their
+        # shutdowns overlap), then wait for the whole set at once
+        for role, proc in _iter_targets():
+            labels[proc.pid] = role_labels[role]
+            try:
+                proc.kill() if force else proc.terminate()
+                procs.append(proc)
+            except psutil.NoSuchProcess:
+                pass
+            except Exception as e:
+                out.append(f"❌ Error stopping {role_labels[role]} (PID: {proc.pid}): {e}\n")
+
+        if not procs:
+            out.append("ℹ️ No Sopy server processes found\n")
+            return 1
+
+        gone, alive = psutil.wait_procs(procs, timeout=5)
+        for proc in gone:
+            out.append(f"✅ {labels[proc.pid]} (PID: {proc.pid}) stopped successfully\n")
+
+        # Escalate to SIGKILL for anything that ignored SIGTERM
+        for proc in alive:
+            out.append(f"⚠️ {labels[proc.pid]} (PID: {proc.pid}) did not stop gracefully, forcing termination\n")
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+        if alive:
+            gone, _ = psutil.wait_procs(alive, timeout=5)
+            for proc in gone:
+                out.append(f"✅ {labels[proc.pid]} (PID: {proc.pid}) forcefully terminated\n")
+
+        return 0
+    finally:
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
+
 def main():
     """Main entry point."""
-    parser = argparse.ArgumentParser(description="Stop the Sopy server processes")
-    parser.add_argument("-f", "--force", action="store_true", help="Force termination of processes")
-    
-    args = parser.parse_args()
-    
+    args = sys.argv[1:]
+    if '-h' in args or '--help' in args:
+        # argparse only exists to print usage; don't pay for building a
+        # parser on the normal path
+        import argparse
+        parser = argparse.ArgumentParser(description="Stop the Sopy server processes")
+        parser.add_argument("-f", "--force", action="store_true", help="Force termination of processes")
+        parser.parse_args(args)
+        return 0
+
+    force = '--force' in args or '-f' in args
+
     try:
-        return stop_server()
+        return stop_server(force=force)
     except KeyboardInterrupt:
         print("\n\U0001F6D1 Stopping server termination (interrupted by user)")
         return 1
     except Exception as e:
-        print(f"\u274C Error stopping server: {e}")
+        print(f"❌ Error stopping server: {e}")
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
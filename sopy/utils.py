@@ -1,20 +1,57 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 from pathlib import Path
 
+# Shared size policy for logs/server.log: applied here by the
+# RotatingFileHandler for this process's own records, and enforced by
+# start_server before it hands the uvicorn child a raw append fd whose
+# writes never pass through the handler
+LOG_MAX_BYTES = 64 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
 def setup_logging():
-    """Set up logging configuration."""
+    """Set up logging configuration.
+
+    The root logger gets only a QueueHandler, so a log call on the hot
+    path is just a queue put; formatting and the file/console writes run
+    in the QueueListener's background thread. Hot-path debug formatting
+    should still be gated with logger.isEnabledFor(logging.DEBUG).
+    """
     # Create logs directory if it doesn't exist
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
-    
-    # Configure logging
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(logs_dir / "server.log"),
-            logging.StreamHandler()  # Also log to console
-        ]
+
+    root = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers):
+        # Already configured (setup_logging called more than once)
+        return logging.getLogger(__name__)
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    # Size-based rotation bounds the file instead of growing (or piling
+    # up one file per restart) forever
+    file_handler = logging.handlers.RotatingFileHandler(
+        logs_dir / "server.log", maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
     )
-    
-    return logging.getLogger(__name__)
\ No newline at end of file
+    stream_handler = logging.StreamHandler()  # Also log to console
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(-1)
+    root.setLevel(logging.INFO)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, stream_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    # Skip the per-record caller-frame walk and thread/process lookups;
+    # none of those fields appear in the format string above
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging._srcfile = None
+
+    return logging.getLogger(__name__)